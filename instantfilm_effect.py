@@ -1,5 +1,9 @@
 import argparse
-from PIL import Image, ImageOps, ImageEnhance, ImageDraw, ImageFilter, ImageChops
+import functools
+import importlib.util
+import math
+import os
+from PIL import Image, ImageEnhance, ImageDraw, ImageFilter
 import numpy as np
 
 verbose_output = False  # 実行ログを表示するかどうか
@@ -18,9 +22,9 @@ def create_instax_frame(image, scale=10):
     入力画像の中央部を「横46mm×縦62mm」のアスペクト比でクロップし、
     「横54mm×縦86mm」のinstax mini風の枠内に（上寄せで）配置した画像を作成する関数。
 
-    :param input_path: 入力画像のファイルパス
+    :param image: 入力画像 (RGBのndarray, uint8)
     :param scale: mmからピクセルへの変換係数。例：scale=10なら1mm=10ピクセル
-    :return: instax mini風に加工されたImageオブジェクト
+    :return: instax mini風に加工された画像 (RGBのndarray, uint8)
     """
     # --- 各サイズ（mm単位） ---
     inner_width_mm = 46  # クロップした画像の幅
@@ -35,7 +39,7 @@ def create_instax_frame(image, scale=10):
     frame_height_px = frame_height_mm * scale  # 86mm -> 860px
 
     # --- 画像の縦横比取得 ---
-    img_width, img_height = image.size
+    img_height, img_width = image.shape[:2]
     vlog(f"create_instax_frame: 元画像サイズ: {img_width}x{img_height}px")
 
     # --- 画像の中央クロップ ---
@@ -59,19 +63,23 @@ def create_instax_frame(image, scale=10):
     bottom = top + new_height
     vlog(f"create_instax_frame: クロップ: {(left, top, right, bottom)}")
 
-    cropped_img = image.crop((left, top, right, bottom))
+    # ndarrayのスライスなのでクロップ自体はコピーを伴わない
+    cropped_img = Image.fromarray(image[top:bottom, left:right])
 
     # --- クロップした画像をinstax mini用の内側サイズにリサイズ ---
+    # 写真そのものは画質を優先してLANCZOSを使う
     resized_cropped = cropped_img.resize(
         (inner_width_px, inner_height_px), Image.LANCZOS
     )
 
     # --- instax mini風の枠を作成 ---
     # 枠は白いキャンバスを作成し、上部にリサイズ済みクロップ画像を貼り付け（下部に厚い余白ができる）
-    framed_image = Image.new("RGB", (frame_width_px, frame_height_px), "white")
+    framed_image = np.full((frame_height_px, frame_width_px, 3), 255, dtype=np.uint8)
     paste_x = (frame_width_px - inner_width_px) // 2  # 水平方向の中央
     paste_y = 70  # 上端に貼り付け
-    framed_image.paste(resized_cropped, (paste_x, paste_y))
+    framed_image[
+        paste_y : paste_y + inner_height_px, paste_x : paste_x + inner_width_px
+    ] = np.asarray(resized_cropped)
 
     return framed_image
 
@@ -80,15 +88,12 @@ def estimate_leak_intensity(image):
     """
     入力画像の全体の明るさに基づいて、光漏れ強度（intensity）を自動設定します。
 
-    :param image: PIL.Image オブジェクト
+    :param image: 入力画像 (RGBのndarray, uint8)
     :return: 推定された強度（float, 0.0〜1.0）
     """
-    image = image.convert("RGB")
-    np_image = np.array(image)
-
     # 輝度 = RGB平均でざっくりと定義
-    brightness = np.mean(np_image, axis=2)
-    avg_brightness = np.mean(brightness)
+    # 全チャンネルを等しく重み付けするので、画素ごとの平均の平均は全要素の平均と等しい
+    avg_brightness = image.mean(dtype=np.float32)
 
     vlog(f"estimate_leak_intensity: 画像の平均輝度: {avg_brightness:.2f}")
 
@@ -108,52 +113,163 @@ def estimate_leak_light_color(image, brightness_threshold=200):
     """
     入力画像の明るいピクセルから平均色（光漏れに使えそうな色）を推定します。
 
-    :param image: PILのImageオブジェクト
+    :param image: 入力画像 (RGBのndarray, uint8)
     :param brightness_threshold: 明るさの閾値（RGBの平均値）
     :return: 推定された光漏れカラー (R, G, B)
     """
-    image = image.convert("RGB")
-    np_image = np.array(image)
-
     # RGBの平均 = 明るさの近似値とする
-    brightness = np.mean(np_image, axis=2)
+    # 3で割る代わりに閾値を3倍し、RGBの合計(uint16)のまま整数で比較する
+    brightness_sum = image.sum(axis=2, dtype=np.uint16)
 
     # 明るいピクセルを抽出
-    mask = brightness > brightness_threshold
-    bright_pixels = np_image[mask]
+    mask = brightness_sum > brightness_threshold * 3
+    count = np.count_nonzero(mask)
 
-    if bright_pixels.size == 0:
+    if count == 0:
         # 明るいピクセルがなかった場合は白に近い色にする
         return (255, 255, 255)
 
+    # 明るいピクセルの色の合計を計算
+    if count < mask.size // 4:
+        # 明るいピクセルが少ない場合は、抽出してコピーしても小さいのでそのまま合計する
+        sum_rgb = image[mask].sum(axis=0, dtype=np.uint64)
+    else:
+        # 明るいピクセルが多い場合は、抽出のコピーを避けてマスクとの積和(einsum)で合計する
+        sum_rgb = np.einsum("ij,ijc->c", mask.view(np.uint8), image, dtype=np.uint64)
+
     # 明るいピクセルの平均色を計算
-    avg_color = np.mean(bright_pixels, axis=0).astype(int)
+    avg_color = (sum_rgb // count).astype(np.int64)
     vlog(f"estimate_leak_light_color: 光源色推定: {avg_color}")
     return tuple(avg_color)
 
 
-def add_light_leak_effect(
-    image, leak_color=(255, 200, 0), intensity=0.5, leak_position="upper_right"
-):
+def _screen_blend_numpy(image_array, leak_array, intensity_q8):
     """
-    与えられたPillowのImageオブジェクトに光漏れ風エフェクトを付与する関数
+    screen合成とブレンドをまとめて行う（NumPy版）。
 
-    :param image: インスタントフィルム風の画像 (Pillow Imageオブジェクト)
-    :param leak_color: 光漏れ効果に使用する色 (R, G, B)
-    :param intensity: 光漏れ効果の強さ (0.0〜1.0、1.0に近いほど強め)
-    :param leak_position: "upper_right", "upper_left", "bottom_right", "bottom_left" から選択
-    :return: 光漏れ効果を適用したImageオブジェクト
+    :param image_array: 元画像 (uint8, H×W×3)
+    :param leak_array: 光漏れレイヤー (uint8, H×W×3)
+    :param intensity_q8: ブレンド率を256倍した整数 (0〜256)
+    :return: 合成結果 (uint8, H×W×3)
     """
-    width, height = image.size
-    vlog(
-            f"add_light_leak_effect: 光漏れを追加します。強度: {intensity}, 位置: {leak_position}, 色: {leak_color}"
+    a = image_array.astype(np.uint16)
+    b = leak_array.astype(np.uint16)
+    # screen = 255 - (255-a)*(255-b)/255
+    # /255 は丸め付きの整数演算 ((x + 128) + ((x + 128) >> 8)) >> 8 で計算する
+    product = (255 - a) * (255 - b) + 128
+    screen = 255 - ((product + (product >> 8)) >> 8)
+    # intensityで元画像とのブレンド率を調整（Q8固定小数点、screen >= a なので符号なしで良い）
+    blended = a + (((screen - a) * intensity_q8) >> 8)
+    return blended.astype(np.uint8)
+
+
+def _load_screen_blend_cv2():
+    """
+    OpenCV版のscreen合成＋ブレンドを生成する。
+    cv2のimportには時間がかかるため、指定された時に初めて読み込む。
+
+    :return: OpenCV版の関数。OpenCVがインストールされていない場合はNone
+    """
+    try:
+        import cv2
+    except ImportError:
+        return None
+
+    def _screen_blend_cv2(image_array, leak_array, intensity_q8):
+        """
+        screen合成とブレンドをまとめて行う（OpenCV版）。
+        OpenCVのSIMD化された算術演算を使う。丸めの違いでNumPy版と最大1階調ずれることがある。
+        """
+        # screen = 255 - (255-a)*(255-b)/255
+        product = cv2.multiply(
+            cv2.bitwise_not(image_array), cv2.bitwise_not(leak_array), scale=1 / 255.0
         )
+        screen = cv2.bitwise_not(product)
+        intensity = intensity_q8 / 256
+        return cv2.addWeighted(image_array, 1 - intensity, screen, intensity, 0)
 
-    # --- 光漏れ用のレイヤー作成 ---
-    # 元サイズと同じ黒背景のキャンバス
-    leak_layer = Image.new("RGB", (width, height), (0, 0, 0))
-    draw = ImageDraw.Draw(leak_layer)
+    return _screen_blend_cv2
+
+
+def _load_screen_blend_numba():
+    """
+    Numba版のscreen合成＋ブレンドを生成する。
+    numbaのimportとJITコンパイルには時間がかかるため、指定された時に初めて読み込む。
 
+    :return: Numba版の関数。numbaがインストールされていない場合はNone
+    """
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _screen_blend_numba(image_array, leak_array, intensity_q8):
+        """
+        screen合成とブレンドをまとめて行う（Numba版）。
+        各画素を1回だけ読み書きし、行単位で並列化する。計算式はNumPy版と同じ。
+        """
+        height, width, channels = image_array.shape
+        out = np.empty_like(image_array)
+        for y in prange(height):
+            for x in range(width):
+                for c in range(channels):
+                    a = np.int32(image_array[y, x, c])
+                    b = np.int32(leak_array[y, x, c])
+                    product = (255 - a) * (255 - b) + 128
+                    screen = 255 - ((product + (product >> 8)) >> 8)
+                    out[y, x, c] = a + (((screen - a) * intensity_q8) >> 8)
+        return out
+
+    return _screen_blend_numba
+
+
+# 合成処理の実装ごとの読み込み関数（autoの場合はこの順で優先する）
+SCREEN_BLEND_LOADERS = {
+    "opencv": ("cv2", _load_screen_blend_cv2),
+    "numba": ("numba", _load_screen_blend_numba),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_screen_blend(backend="numpy"):
+    """
+    screen合成＋ブレンドの実装を選ぶ。光漏れを合成する時に初めて呼ばれ、
+    選ばれた実装のモジュールだけをimportする。
+
+    OpenCV・numbaはimport（numbaはさらにJITコンパイル）のコストが合成処理の短縮分より
+    大きく、1枚だけの処理では元が取れないため、明示的に指定された場合のみ使う。
+
+    :param backend: "numpy", "opencv", "numba", "auto"（OpenCV > numba > NumPy の順で利用可能なもの）
+    :return: screen合成＋ブレンドを行う関数
+    """
+    if backend == "auto":
+        # importせずにインストールの有無だけを調べ、使うものだけを読み込む
+        for name, (module, _) in SCREEN_BLEND_LOADERS.items():
+            if importlib.util.find_spec(module) is not None:
+                backend = name
+                break
+
+    if backend in SCREEN_BLEND_LOADERS:
+        screen_blend = SCREEN_BLEND_LOADERS[backend][1]()
+        if screen_blend is not None:
+            return screen_blend
+        vlog(f"_get_screen_blend: {backend}が見つからないためNumPy版を使います")
+    return _screen_blend_numpy
+
+
+@functools.lru_cache(maxsize=32)
+def _make_leak_layer(width, height, leak_position, leak_color):
+    """
+    ぼかし済みの光漏れレイヤーを生成する。
+    同じ画像サイズ・位置・色の組み合わせではぼかし結果を再利用できるよう、結果をキャッシュする。
+
+    :param width: 画像の幅
+    :param height: 画像の高さ
+    :param leak_position: 光漏れの位置
+    :param leak_color: 光漏れ効果に使用する色 (R, G, B)
+    :return: (処理範囲 (left, top, right, bottom), 光漏れレイヤーのndarray (uint8, 読み取り専用))
+    """
     # --- 光漏れの位置と形状の決定 ---
     # ここでは楕円形で光漏れ効果を再現
     if leak_position == "upper_right":
@@ -167,18 +283,95 @@ def add_light_leak_effect(
     else:
         ellipse_box = [int(width * 0.6), 0, width, int(height * 0.5)]
 
-    # 楕円形で光漏れ部分を描画
-    draw.ellipse(ellipse_box, fill=leak_color)
+    blur_radius = int(width * 0.1)  # 画像サイズに対するぼかし半径（調整可能）
+
+    # --- 処理範囲(ROI)の決定 ---
+    # 楕円の外側はぼかし後もほぼ黒で、screen合成しても変化しないため、
+    # 楕円をぼかし半径の3倍だけ広げた範囲だけを処理する
+    pad = 3 * blur_radius
+    roi_box = (
+        max(0, ellipse_box[0] - pad),
+        max(0, ellipse_box[1] - pad),
+        min(width, ellipse_box[2] + pad),
+        min(height, ellipse_box[3] + pad),
+    )
+    roi_width = roi_box[2] - roi_box[0]
+    roi_height = roi_box[3] - roi_box[1]
+
+    # --- 光漏れ用のレイヤー作成 ---
+    # 強いぼかしをかけるレイヤーなので、縮小したキャンバス上で描画・ぼかしを行い、
+    # 最後に元サイズへ拡大する（低周波成分しか残らないため見た目はほぼ変わらない）
+    # ※ 放射状グラデーションのLUTで解析的に生成する方法も試したが、縮小キャンバス上の
+    #   ぼかしの方が速く、画像端での見た目も変わってしまうため採用していない
+    downscale = 4
+    small_width = max(1, roi_width // downscale)
+    small_height = max(1, roi_height // downscale)
+    leak_layer = Image.new("RGB", (small_width, small_height), (0, 0, 0))
+    draw = ImageDraw.Draw(leak_layer)
+
+    # 楕円形で光漏れ部分をROI基準の縮小キャンバス上に描画
+    small_box = [
+        (ellipse_box[0] - roi_box[0]) * small_width / roi_width,
+        (ellipse_box[1] - roi_box[1]) * small_height / roi_height,
+        (ellipse_box[2] - roi_box[0]) * small_width / roi_width,
+        (ellipse_box[3] - roi_box[1]) * small_height / roi_height,
+    ]
+    draw.ellipse(small_box, fill=leak_color)
 
     # --- 自然な感じにするためにぼかしを適用 ---
-    blur_radius = int(width * 0.1)  # 画像サイズに対するぼかし半径（調整可能）
-    leak_layer = leak_layer.filter(ImageFilter.GaussianBlur(radius=blur_radius))
+    # ガウシアンぼかしをボックスぼかし3回で近似する（半径によらず1画素あたりO(1)）
+    # 3回分の分散の合計がガウシアンの分散 sigma^2 と一致するように半径を決める
+    sigma = blur_radius / downscale
+    box_radius = (math.sqrt(4 * sigma**2 + 1) - 1) / 2
+    for _ in range(3):
+        leak_layer = leak_layer.filter(ImageFilter.BoxBlur(box_radius))
+    # ぼかし済みの低周波なマスクなので、拡大はLANCZOSではなく軽量なBILINEARで十分
+    leak_layer = leak_layer.resize((roi_width, roi_height), Image.BILINEAR)
+
+    leak_array = np.array(leak_layer)
+    leak_array.flags.writeable = False  # キャッシュを共有するため書き換えを禁止する
+    return roi_box, leak_array
+
+
+def add_light_leak_effect(
+    image,
+    leak_color=(255, 200, 0),
+    intensity=0.5,
+    leak_position="upper_right",
+    blend_backend="numpy",
+):
+    """
+    与えられた画像に光漏れ風エフェクトを付与する関数
+
+    :param image: インスタントフィルム風の画像 (RGBのndarray, uint8)
+    :param leak_color: 光漏れ効果に使用する色 (R, G, B)
+    :param intensity: 光漏れ効果の強さ (0.0〜1.0、1.0に近いほど強め)
+    :param leak_position: "upper_right", "upper_left", "bottom_right", "bottom_left" から選択
+    :param blend_backend: 合成処理の実装 ("numpy", "opencv", "numba", "auto")
+    :return: 光漏れ効果を適用した画像 (RGBのndarray, uint8)
+    """
+    if intensity <= 0:
+        return image
+
+    height, width = image.shape[:2]
+    vlog(
+            f"add_light_leak_effect: 光漏れを追加します。強度: {intensity}, 位置: {leak_position}, 色: {leak_color}"
+        )
+
+    # ぼかし済みの光漏れレイヤーを取得（キャッシュ済みなら再利用）
+    leak_color = tuple(int(c) for c in leak_color)
+    roi_box, leak_array = _make_leak_layer(width, height, leak_position, leak_color)
 
     # --- 光漏れ効果の合成 ---
-    # ImageChops.screenにより、明るい部分が強調される演出
-    combined = ImageChops.screen(image, leak_layer)
-    # intensityで元画像とのブレンド率を調整
-    result = Image.blend(image, combined, intensity)
+    # screen合成（明るい部分が強調される演出）とintensityによるブレンドを1回の処理で行う
+    intensity_q8 = int(round(intensity * 256))
+    left, top, right, bottom = roi_box
+    screen_blend = _get_screen_blend(blend_backend)
+    blended = screen_blend(image[top:bottom, left:right], leak_array, intensity_q8)
+
+    # ROI部分だけを書き戻す
+    result = image.copy()
+    result[top:bottom, left:right] = blended
 
     return result
 
@@ -186,36 +379,49 @@ def add_light_leak_effect(
 def add_vignette_effect(image, strength=0.3):
     """
     周辺減光（ヴィネット）を適用する関数。
-    :param image: PIL.Image
+    :param image: RGBのndarray (uint8)
     :param strength: 0.0〜1.0で減光の強さを指定（例: 0.3）
-    :return: 減光処理を加えたImage
+    :return: 減光処理を加えた画像 (RGBのndarray, uint8)
     """
 
+    if strength <= 0:
+        return image
+
     vlog(f"add_vignette_effect: 周辺減光の追加を行います。強度：{strength}")
 
-    image = image.convert("RGB")
-    width, height = image.size
+    height, width = image.shape[:2]
     center_x, center_y = width / 2, height / 2
     max_distance = (center_x**2 + center_y**2) ** 0.5
 
-    np_image = np.array(image).astype(np.float32)
-
-    # 距離に応じて暗くするマスクを生成
-    for y in range(height):
-        for x in range(width):
-            dx = x - center_x
-            dy = y - center_y
-            distance = (dx**2 + dy**2) ** 0.5
-            darken_factor = 1 - strength * (distance / max_distance)
-            np_image[y, x] *= darken_factor
+    # 距離に応じて暗くするマスクを生成（画素ごとのループを避け、ブロードキャストで一括計算）
+    yy, xx = np.ogrid[0:height, 0:width]
+    dx = (xx - center_x).astype(np.float32)
+    dy = (yy - center_y).astype(np.float32)
+    distance = np.sqrt(dx**2 + dy**2)
 
-    np_image = np.clip(np_image, 0, 255).astype(np.uint8)
-    return Image.fromarray(np_image)
+    # マスクは 0〜255 のuint8で持ち、uint8画像との積をuint16で受けて255で割る
+    # mask <= 1 なので結果は必ず 0〜255 に収まり、clipは不要
+    mask_u8 = np.round((1 - strength * (distance / max_distance)) * 255).astype(
+        np.uint8
+    )
+    np_image = np.multiply(image, mask_u8[..., None], dtype=np.uint16)
+    np_image //= 255
+    return np_image.astype(np.uint8)
 
 
 def add_outer_border(image, border_size=1, color=(192, 192, 192)):
     vlog(f"add_outer_border: 外枠をつけます: Color {color} {border_size}px")
-    return ImageOps.expand(image, border=border_size, fill=color)
+    height, width = image.shape[:2]
+
+    # 枠色で塗りつぶした配列を1回だけ確保し、中央に元画像をコピーする
+    padded = np.empty(
+        (height + 2 * border_size, width + 2 * border_size, 3), dtype=np.uint8
+    )
+    padded[...] = color
+    padded[border_size : border_size + height, border_size : border_size + width] = (
+        image
+    )
+    return padded
 
 
 def parse_argument():
@@ -259,6 +465,19 @@ def parse_argument():
         default=0,
         help="枠線の太さを指定します。デフォルトは 0 (枠線なし)です。",
     )
+    parser.add_argument(
+        "--jpeg-quality",
+        "--jq",
+        type=int,
+        default=92,
+        help="JPEGで出力する場合の画質を指定します。範囲は 1 から 95 で、デフォルトは 92 です。",
+    )
+    parser.add_argument(
+        "--blend-backend",
+        choices=["numpy", "opencv", "numba", "auto"],
+        default="numpy",
+        help="光漏れの合成処理の実装を選択します。opencv, numba は読み込みに時間がかかるため、多数の画像を処理する場合向けです。auto はインストールされているものを opencv, numba, numpy の順で選びます。デフォルトは numpy です。",
+    )
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="処理状況を表示します"
     )
@@ -287,6 +506,17 @@ def main():
     # --- 画像の読み込み ---
     try:
         image = Image.open(args.input_file)
+        # JPEGの場合はlibjpegの縮小デコード(1/2〜1/8)で読み込みを高速化する
+        # 最終的な写真サイズ(460x620px)の縦横2倍を指定する。中央クロップは横長なら高さ、
+        # 縦長なら幅を全て使うため、どの向きでもクロップ後に写真サイズの2倍以上が残る
+        # (JPEG以外では何もしない)
+        image.draft("RGB", (920, 1240))
+        image.load()
+        # 以降の処理はRGB画像を前提とするため、読み込み時に一度だけ変換しておく
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        # 以降の処理はndarrayのまま受け渡し、PILへの変換は保存時などの境界のみで行う
+        image = np.asarray(image)
     except FileNotFoundError:
         print(f"Error: 入力ファイルが見つかりません: {args.input_file}")
         exit(1)
@@ -294,16 +524,28 @@ def main():
         print(f"Error: 入力画像の読み込みに失敗しました: {e}")
         exit(1)
 
+    # JPEG画質範囲チェック
+    jpeg_quality = args.jpeg_quality
+    if jpeg_quality > 95 or jpeg_quality < 1:
+        print(f"Error: Out of bound for jpeg-quality: {jpeg_quality}")
+        exit(1)
+
     # 周辺減光強度範囲チェック
     vignette_strength = args.vignette_strength
     if vignette_strength > 1.0 or vignette_strength < 0.0:
         print(f"Error: Out of bound for vinette-strength: {vignette_strength}")
         exit(1)
 
+    # 光漏れを適用するかどうかを先に判定し、適用しない場合は推定処理ごと省略する
+    style = args.leak_style
+    apply_leak = (
+        CONST_LEAK_STYLE[style] is not None and args.leak_position != "none"
+    )
+
     # 光漏れ強度設定(前処理)
     leak_intensity = args.leak_intensity
     if leak_intensity == "auto":
-        leak_intensity = estimate_leak_intensity(image)
+        leak_intensity = estimate_leak_intensity(image) if apply_leak else 0.0
     # 光漏れ強度範囲チェック
     else:
         try:
@@ -314,19 +556,18 @@ def main():
         if leak_intensity > 1.0 or leak_intensity < 0.0:
             print(f"Error: Out of bound for leak-intensity: {leak_intensity}")
             exit(1)
-
-
+    if leak_intensity == 0:
+        apply_leak = False  # 強度0なら光漏れの描画・合成は不要
 
     # 周辺減光処理(実処理)
     if vignette_strength > 0:
         image = add_vignette_effect(image, vignette_strength)
 
     # 光漏れ処理(実処理)
-    style = args.leak_style
-    if CONST_LEAK_STYLE[style] == "auto":
-        leak_color = estimate_leak_light_color(image)
-    elif CONST_LEAK_STYLE[style] is None:
+    if not apply_leak:
         leak_color = None  # 光漏れスキップ
+    elif CONST_LEAK_STYLE[style] == "auto":
+        leak_color = estimate_leak_light_color(image)
     else:
         leak_color = CONST_LEAK_STYLE[style]
 
@@ -334,7 +575,7 @@ def main():
     instax_image = create_instax_frame(image, scale=10)
 
     # 光漏れ効果を追加
-    if leak_color is None or args.leak_position == "none":
+    if leak_color is None:
         final_image = instax_image
     else:
         final_image = add_light_leak_effect(
@@ -342,6 +583,7 @@ def main():
             leak_color=leak_color,
             intensity=leak_intensity,  # 効果の強さ（0.0～1.0）
             leak_position=args.leak_position,  # 光漏れの位置（引数で指定）
+            blend_backend=args.blend_backend,  # 合成処理の実装（引数で指定）
         )
 
     # 外枠を追加
@@ -350,7 +592,17 @@ def main():
 
     # 出力画像として指定されたファイルパスに保存
     try:
-        final_image.save(args.output_file)
+        save_options = {}
+        output_ext = os.path.splitext(args.output_file)[1].lower()
+        if Image.registered_extensions().get(output_ext) == "JPEG":
+            # Huffmanテーブル最適化やプログレッシブ化の追加パスを行わないよう明示する
+            save_options = {
+                "quality": jpeg_quality,
+                "optimize": False,
+                "progressive": False,
+                "subsampling": 2,  # 4:2:0
+            }
+        Image.fromarray(final_image).save(args.output_file, **save_options)
         if verbose_output:
             print(f"画像を保存しました: {args.output_file}")
     except Exception as e: